@@ -17,7 +17,7 @@
 """Small library for persistent identifiers used in scholarly communication."""
 
 import importlib
-import pkgutil
+import inspect
 from warnings import warn
 
 warn(
@@ -29,20 +29,73 @@ warn(
 __version__ = "1.4.2"
 
 
+_SUBMODULES = (
+    "detectors",
+    "ext",
+    "normalizers",
+    "proxies",
+    "schemes",
+    "utils",
+    "validators",
+)
+"""Submodules whose public attributes are importable from the package.
+
+In import order, later modules win on name clashes."""
+
+
+def _public_names(module):
+    """Return the public names defined by a submodule.
+
+    Uses the ``__all__`` of the submodule if it has one. Otherwise leaves out
+    the modules, functions and classes it imports from outside the package,
+    e.g. ``re`` or ``lru_cache``.
+    """
+    if hasattr(module, "__all__"):
+        return list(module.__all__)
+    names = []
+    for attribute_name, attribute in vars(module).items():
+        if attribute_name.startswith("_") or inspect.ismodule(attribute):
+            continue
+        if inspect.isroutine(attribute) or inspect.isclass(attribute):
+            origin = getattr(attribute, "__module__", None) or ""
+            if origin.partition(".")[0] != __name__:
+                continue
+        names.append(attribute_name)
+    return names
+
+
 def import_attributes():
     """For backwards compatibility! Import everything for `idutils.__func__` and `from idutils import __func__` to work."""
     package_name = __name__
+    public_names = []
 
-    importlib.import_module
-    for _, file_name, _ in pkgutil.walk_packages(__path__):
+    for file_name in _SUBMODULES:
         module = importlib.import_module(f".{file_name}", package_name)
 
-        for attribute_name in dir(module):
-            attribute = getattr(module, attribute_name)
-
+        for attribute_name, attribute in vars(module).items():
             # Make sure it's not private or built-in
             if not attribute_name.startswith("_"):
                 globals()[attribute_name] = attribute
+        public_names.extend(_public_names(module))
+
+    # Only export what the submodules define, not what they import
+    globals()["__all__"] = list(dict.fromkeys(public_names))
+
+
+def __getattr__(name):
+    """Import the submodules on first access to one of their attributes.
 
+    Keeps ``idutils.function`` working without importing every submodule on
+    ``import idutils``.
+    """
+    if name.startswith("_") and name != "__all__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
 
-import_attributes()
+    if "__all__" not in globals():
+        import_attributes()
+    try:
+        return globals()[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
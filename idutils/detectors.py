@@ -13,10 +13,17 @@
 
 """Functions for detecting the persistent identifier."""
 
+import string
+from collections import namedtuple
+from functools import lru_cache
+
 from . import validators
+from .ext import CustomSchemesRegistry
 from .proxies import custom_schemes_registry
 from .schemes import IDUTILS_PID_SCHEMES as _IDUTILS_PID_SCHEMES
 from .schemes import IDUTILS_SCHEME_FILTER as _IDUTILS_SCHEME_FILTER
+from .schemes import _TrackedList
+from .utils import _VIAF_URLS, ENSEMBL_PREFIXES
 
 IDUTILS_PID_SCHEMES = _IDUTILS_PID_SCHEMES
 """Definition of scheme name and associated test function.
@@ -29,51 +36,334 @@ IDUTILS_SCHEME_FILTER = _IDUTILS_SCHEME_FILTER
 """(present_scheme, [list of schemes to remove if present_scheme found])."""
 
 
+_SCHEME_FIRST_CHARS = {
+    "doi": "1dh",
+    "ark": "ah",
+    "purl": "h",
+    "lsid": "u",
+    "urn": "u",
+    "ads": string.digits + "a",
+    "arxiv": string.ascii_lowercase + string.digits + "-",
+    "ascl": "a",
+    "hal": string.ascii_lowercase,
+    "pmcid": "p",
+    "issn": string.digits + "x-",
+    "orcid": string.digits + "h-",
+    "isni": string.digits + "-",
+    "ean13": string.digits,
+    "ean8": string.digits,
+    "istc": string.hexdigits.lower() + "-",
+    "gnd": "123456789gh",
+    "ror": "0hr",
+    "pmid": string.digits + "hp",
+    # Older Pythons also accept digits and "+-." at the start of a URL scheme
+    "url": string.ascii_lowercase + string.digits + "+-.",
+    "sra": "des",
+    "bioproject": "p",
+    "biosample": "s",
+    "ensembl": "".join(set(prefix[0].lower() for prefix in ENSEMBL_PREFIXES)),
+    "uniprot": string.ascii_lowercase,
+    "refseq": "anwxy",
+    "genome": "g",
+    "geo": "g",
+    "arrayexpress_array": "a",
+    "arrayexpress_experiment": "e",
+    "swh": "s",
+    "viaf": "123456789hv",
+}
+"""Lower case characters a value of the given scheme can start with.
+
+Schemes which are not listed (e.g. handle and isbn) can start with any
+character."""
+
+
+_SCHEME_LENGTHS = {
+    "doi": (6, None),
+    "ark": (8, None),
+    "lsid": (14, None),
+    "arxiv": (7, None),
+    "ascl": (13, None),
+    "hal": (12, None),
+    "pmcid": (4, None),
+    "issn": (8, None),
+    "orcid": (16, None),
+    "isni": (16, None),
+    "ean13": (13, 13),
+    "ean8": (8, 8),
+    "istc": (16, None),
+    "isbn": (10, None),
+    "gnd": (3, None),
+    "ror": (9, None),
+    "sra": (4, None),
+    "bioproject": (6, None),
+    "biosample": (5, None),
+    "ensembl": (14, None),
+    "uniprot": (6, None),
+    "refseq": (4, None),
+    "genome": (7, None),
+    "geo": (4, None),
+    "arrayexpress_array": (8, None),
+    "arrayexpress_experiment": (8, None),
+    "swh": (50, None),
+}
+"""Minimum and maximum (or None) length of a value of the given scheme.
+
+Schemes which are not listed can have any length, e.g. ADS codes, which are
+NFKD normalized and so can be shorter than the codes they expand to."""
+
+_MAX_LENGTH_BUCKET = 1 + max(
+    max(bound for bound in bounds if bound is not None)
+    for bounds in _SCHEME_LENGTHS.values()
+)
+"""Values at least this long all share the same candidate schemes."""
+
+
+def _length_allowed(scheme, length):
+    """Return whether a value of the given length can be of the scheme."""
+    min_length, max_length = _SCHEME_LENGTHS.get(scheme, (0, None))
+    return min_length <= length and (max_length is None or length <= max_length)
+
+
+def _build_scheme_candidates(entries):
+    """Return the candidate tests for each printable ASCII first character.
+
+    ``entries`` are the ``(scheme, bit, test)`` triples of the scheme list.
+    The ``(bit, test)`` candidates of a character are listed by value length,
+    with all lengths from ``_MAX_LENGTH_BUCKET`` on sharing the last entry.
+    Values starting with any other character (whitespace, control or
+    non-ASCII characters, which some validators strip or normalize) are
+    tested against all schemes. Entries testing anything else than the
+    built-in validator of their scheme are tested against all values.
+    Validators which only match a pattern are replaced by the bound matcher
+    they call.
+    """
+    shared = {}
+    candidates = {}
+    for char in map(chr, range(0x21, 0x7F)):
+        candidates[char] = by_length = []
+        for length in range(_MAX_LENGTH_BUCKET + 1):
+            tests = tuple(
+                (bit, validators._PATTERN_VALIDATORS.get(test, test))
+                for scheme, bit, test in entries
+                if test is not getattr(validators, "is_" + scheme, None)
+                or (
+                    char.lower() in _SCHEME_FIRST_CHARS.get(scheme, char.lower())
+                    and _length_allowed(scheme, length)
+                )
+            )
+            by_length.append(shared.setdefault(tests, list(tests)))
+    return candidates
+
+
+def _schemes_mask(schemes, scheme_masks):
+    """Return the bit mask of the given scheme names."""
+    mask = 0
+    for scheme in schemes:
+        mask |= scheme_masks.get(scheme, 0)
+    return mask
+
+
+class _SchemeTables(
+    namedtuple(
+        "_SchemeTables",
+        [
+            "pid_schemes",
+            "scheme_filter",
+            "changes",
+            "snapshot",
+            "candidates",
+            "validators",
+            "scheme_order",
+            "scheme_masks",
+            "filter_masks",
+        ],
+    )
+):
+    """Detection tables built from the scheme list and filters.
+
+    ``pid_schemes`` and ``scheme_filter`` are the lists the tables were built
+    from and ``changes`` the count of changes to them, or ``None`` if they do
+    not count their changes, in which case ``snapshot`` holds a copy of their
+    entries. Each scheme entry gets its own bit: ``scheme_order`` lists the
+    ``(scheme, bit)`` pairs in detection order and ``scheme_masks`` maps each
+    scheme name to the bits of its entries. ``candidates`` holds the
+    ``(bit, test)`` pairs of :func:`_build_scheme_candidates` and
+    ``validators`` those of all entries.
+
+    The tables are compared and hashed by identity, so that they can be a
+    cache key without hashing their contents.
+    """
+
+    __slots__ = ()
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
+
+
+def _build_scheme_tables():
+    """Return the detection tables of the current schemes and filters."""
+    pid_schemes, scheme_filter = IDUTILS_PID_SCHEMES, IDUTILS_SCHEME_FILTER
+    changes, snapshot = _TrackedList.changes, None
+    if not isinstance(pid_schemes, _TrackedList) or not isinstance(
+        scheme_filter, _TrackedList
+    ):
+        # Lists rebound to plain lists can only be checked by their entries
+        changes, snapshot = None, (tuple(pid_schemes), tuple(scheme_filter))
+    entries = [(scheme, 1 << i, test) for i, (scheme, test) in enumerate(pid_schemes)]
+    scheme_masks = {}
+    for scheme, bit, _ in entries:
+        scheme_masks[scheme] = scheme_masks.get(scheme, 0) | bit
+    filter_masks = [
+        (scheme_masks.get(first, 0), _schemes_mask(remove_schemes, scheme_masks))
+        for first, remove_schemes in scheme_filter
+    ]
+    return _SchemeTables(
+        pid_schemes=pid_schemes,
+        scheme_filter=scheme_filter,
+        changes=changes,
+        snapshot=snapshot,
+        candidates=_build_scheme_candidates(entries),
+        validators=[(bit, test) for _, bit, test in entries],
+        scheme_order=tuple((scheme, bit) for scheme, bit, _ in entries),
+        scheme_masks=scheme_masks,
+        filter_masks=filter_masks,
+    )
+
+
+_scheme_tables = _build_scheme_tables()
+"""Detection tables, rebuilt when the scheme list or filters change."""
+
+
+def _current_scheme_tables():
+    """Return the detection tables, rebuilding them if stale.
+
+    ``IDUTILS_PID_SCHEMES`` and ``IDUTILS_SCHEME_FILTER`` are public and can be
+    changed after import, by adding, removing or replacing entries, or be
+    rebound to other lists. Only the lists themselves are tracked, so a filter
+    entry must be replaced rather than its list of schemes edited in place.
+    """
+    global _scheme_tables
+    tables = _scheme_tables
+    pid_schemes, scheme_filter = IDUTILS_PID_SCHEMES, IDUTILS_SCHEME_FILTER
+    if tables.pid_schemes is pid_schemes and tables.scheme_filter is scheme_filter:
+        if tables.changes == _TrackedList.changes:
+            return tables
+        if tables.snapshot == (tuple(pid_schemes), tuple(scheme_filter)):
+            return tables
+    tables = _scheme_tables = _build_scheme_tables()
+    return tables
+
+
+_HDL_PREFIXES = ("http://hdl.handle.net/", "https://hdl.handle.net/")
+"""Handle proxy URLs, which are detected as handles even though they are URLs."""
+
+
+@lru_cache(maxsize=None)
+def _custom_scheme_tables(tables, registry_version):
+    """Return the validators, scheme order and masks with custom schemes.
+
+    Returns ``(validators, scheme_order, scheme_masks, filter_masks)``, with
+    the custom schemes getting the bits following those of ``tables``. The
+    result only changes when the built-in tables are rebuilt or custom schemes
+    are loaded, hence the ``registry_version`` key.
+    """
+    registry = custom_schemes_registry()
+    custom_validators = registry.pick_scheme_key("validator")
+    if not custom_validators:
+        return [], tables.scheme_order, tables.scheme_masks, tables.filter_masks
+    scheme_order = list(tables.scheme_order)
+    scheme_masks = dict(tables.scheme_masks)
+    validators = []
+    for bit_index, (scheme, test) in enumerate(
+        custom_validators, len(tables.scheme_order)
+    ):
+        bit = 1 << bit_index
+        scheme_order.append((scheme, bit))
+        scheme_masks[scheme] = scheme_masks.get(scheme, 0) | bit
+        validators.append((bit, test))
+    filter_masks = tables.filter_masks + [
+        (scheme_masks.get(first, 0), _schemes_mask(remove_schemes, scheme_masks))
+        for first, remove_schemes in registry.pick_scheme_key("filter")
+    ]
+    return validators, tuple(scheme_order), scheme_masks, filter_masks
+
+
 def detect_identifier_schemes(val):
     """Detect persistent identifier scheme for a given value.
 
     .. note:: Some schemes like PMID are very generic.
+
+    .. note:: Results are cached per value, so ``val`` must be hashable.
+    """
+    # Once the registry is created, read it without going through the proxy
+    registry = CustomSchemesRegistry._instance or custom_schemes_registry()
+    return list(
+        _detect_identifier_schemes(val, _current_scheme_tables(), registry.version)
+    )
+
+
+def detect_identifier_schemes_many(values):
+    """Detect persistent identifier schemes for each of the given values.
+
+    Same as calling :func:`detect_identifier_schemes` on each value, with
+    the per-call lookups done once for the whole batch.
+    """
+    detect = _detect_identifier_schemes
+    tables = _current_scheme_tables()
+    registry_version = custom_schemes_registry().version
+    return [list(detect(val, tables, registry_version)) for val in values]
+
+
+@lru_cache(maxsize=65536)
+def _detect_identifier_schemes(val, tables, registry_version):
+    """Detect the schemes of a value, returned as a tuple for caching.
+
+    ``registry_version`` is only part of the cache key, so that results are
+    not reused across loads of custom schemes.
     """
-    schemes = []
-    scheme_validators = IDUTILS_PID_SCHEMES + custom_schemes_registry().pick_scheme_key(
-        "validator"
+    custom_validators, scheme_order, scheme_masks, filter_masks = _custom_scheme_tables(
+        tables, registry_version
     )
-    for scheme, test in scheme_validators:
+    candidates = tables.candidates.get(val[:1])
+    if candidates:
+        scheme_validators = candidates[min(len(val), _MAX_LENGTH_BUCKET)]
+    else:
+        scheme_validators = tables.validators
+    if custom_validators:
+        scheme_validators = scheme_validators + custom_validators
+
+    found = 0
+    for bit, test in scheme_validators:
         if test(val):
-            schemes.append(scheme)
+            found |= bit
+
+    get_mask = scheme_masks.get
+    ark_bit, arxiv_bit, gnd_bit = (
+        get_mask("ark", 0),
+        get_mask("arxiv", 0),
+        get_mask("gnd", 0),
+    )
+    handle_bit, isbn_bit = get_mask("handle", 0), get_mask("isbn", 0)
+    url_bit, viaf_bit = get_mask("url", 0), get_mask("viaf", 0)
 
     # GNDs and ISBNs numbers can clash...
-    if "gnd" in schemes and "isbn" in schemes:
+    if found & gnd_bit and found & isbn_bit:
         # ...in which case check explicitly if it's clearly a GND
-        if val.lower().startswith("gnd:"):
-            schemes.remove("isbn")
+        if val[:4].lower() == "gnd:":
+            found &= ~isbn_bit
 
-    if "viaf" in schemes and "url" in schemes:
-        # check explicitly if it's a viaf
-        for viaf_url in validators.viaf_urls:
-            if val.startswith(viaf_url):
-                schemes.remove("url")
-    if "viaf" in schemes and "handle" in schemes:
+    if found & viaf_bit and found & (url_bit | handle_bit):
         # check explicitly if it's a viaf
-        for viaf_url in validators.viaf_urls:
-            if val.startswith(viaf_url):
-                schemes.remove("handle")
+        if val.startswith(_VIAF_URLS):
+            found &= ~(url_bit | handle_bit)
 
-    scheme_filter = IDUTILS_SCHEME_FILTER + custom_schemes_registry().pick_scheme_key(
-        "filter"
-    )
-    for first, remove_schemes in scheme_filter:
-        if first in schemes:
-            schemes = list(filter(lambda x: x not in remove_schemes, schemes))
-
-    if (
-        "handle" in schemes
-        and "url" in schemes
-        and not val.startswith("http://hdl.handle.net/")
-        and not val.startswith("https://hdl.handle.net/")
-    ):
-        schemes = list(filter(lambda x: x != "handle", schemes))
-    elif "handle" in schemes and ("ark" in schemes or "arxiv" in schemes):
-        schemes = list(filter(lambda x: x != "handle", schemes))
+    for first_bit, remove_mask in filter_masks:
+        if found & first_bit:
+            found &= ~remove_mask
+
+    if found & handle_bit and found & url_bit and not val.startswith(_HDL_PREFIXES):
+        found &= ~handle_bit
+    elif found & handle_bit and found & (ark_bit | arxiv_bit):
+        found &= ~handle_bit
 
-    return schemes
+    return tuple(scheme for scheme, bit in scheme_order if found & bit)
@@ -48,32 +48,40 @@ Each key is optional and if not provided a default value is defined in
 Note: You can only add new schemes but not override existing ones.
 """
 
+import sys
 from threading import Lock
 
-from importlib_metadata import entry_points
-
 from .schemes import IDUTILS_PID_SCHEMES
 
-# when Python >=3.12, remove importlib_metadata and replace with:
-# from importlib.metadata import entry_points
+if sys.version_info >= (3, 12):
+    from importlib.metadata import entry_points
+else:
+    from importlib_metadata import entry_points
+
+_EXISTING_ID_NAMES = frozenset(scheme[0] for scheme in IDUTILS_PID_SCHEMES)
+"""Names of the built-in schemes, which custom schemes cannot override."""
+
+
+_DEFAULT_CONFIG = {
+    "validator": lambda x: True,
+    "normalizer": lambda x: x,
+    "filter": (),
+    "url_generator": lambda scheme, normalized_pid: None,
+}
+"""Default config of a custom scheme."""
+
+_ALLOWED_KEYS = frozenset(_DEFAULT_CONFIG)
+"""Possible keys of a custom scheme config."""
 
 
 def _set_default_custom_scheme_config(scheme_config):
     """Return the default config for a custom scheme."""
-    # List of possible keys
-    default_config = {
-        "validator": lambda x: True,
-        "normalizer": lambda x: x,
-        "filter": [],
-        "url_generator": lambda scheme, normalized_pid: None,
-    }
-
-    assert all(
-        scheme_key in default_config.keys() for scheme_key in scheme_config.keys()
-    )
+    assert scheme_config.keys() <= _ALLOWED_KEYS
 
     # Merge the provided scheme config with defaults
-    return {**default_config, **scheme_config}
+    merged = _DEFAULT_CONFIG.copy()
+    merged.update(scheme_config)
+    return merged
 
 
 class CustomSchemesRegistry:
@@ -84,13 +92,19 @@ class CustomSchemesRegistry:
 
     def __new__(cls):
         """Create a new instance."""
+        if cls._instance is not None:
+            return cls._instance
         with cls._lock:
             if cls._instance is None:
-                cls._instance = super().__new__(cls)
-                cls._instance._custom_schemes_registry = (
+                instance = super().__new__(cls)
+                instance._custom_schemes_registry = (
                     {}
                 )  # Internal dictionary to store schemes
-                cls._instance._load_entry_points("idutils.custom_schemes")
+                instance._picked_scheme_keys = {}
+                instance._version = 0
+                instance._load_entry_points("idutils.custom_schemes")
+                # Only publish the instance once loaded, as it is read unlocked
+                cls._instance = instance
         return cls._instance
 
     @property
@@ -114,26 +128,39 @@ class CustomSchemesRegistry:
 
             }
 
+        The registry must only be changed by loading entry points, since
+        lookups and detection results are cached per load.
         """
         return self._custom_schemes_registry
 
+    @property
+    def version(self):
+        """Return the number of times custom schemes were loaded.
+
+        Results derived from the registry can be cached per version.
+        """
+        return self._version
+
     def pick_scheme_key(self, key):
         """Serialize the registered custom registered schemes by key.
 
         Return a list of tuples [(<scheme_name>, <scheme_config_key_value>)]
         """
-        return [(scheme, config[key]) for scheme, config in self.custom_schemes.items()]
+        picked = self._picked_scheme_keys.get(key)
+        if picked is None:
+            picked = self._picked_scheme_keys[key] = tuple(
+                (scheme, config[key]) for scheme, config in self.custom_schemes.items()
+            )
+        return list(picked)
 
     def _load_entry_points(self, ep_name):
         """Load entry points into the internal registry."""
-        existing_id_names = set(scheme[0] for scheme in IDUTILS_PID_SCHEMES)
-
         # Load entry points from the specified group
-        for ep in set(entry_points(group=ep_name)):
+        for ep in entry_points(group=ep_name):
             name = ep.name
 
             # Ensure no custom scheme overrides existing ones
-            assert name not in existing_id_names, f"Scheme {name} already exists!"
+            assert name not in _EXISTING_ID_NAMES, f"Scheme {name} already exists!"
 
             # Load the function from entry point
             scheme_register_func = ep.load()
@@ -147,3 +174,6 @@ class CustomSchemesRegistry:
 
             # Store in the registry
             self._custom_schemes_registry.setdefault(name, scheme_config)
+
+        self._picked_scheme_keys.clear()
+        self._version += 1
@@ -14,17 +14,20 @@
 """ID normalizer helper functions."""
 
 import unicodedata
+from functools import lru_cache
 
 import isbnlib
 
 from .proxies import custom_schemes_registry
 from .utils import *
-from .validators import is_arxiv_post_2007, is_arxiv_pre_2007
+from .utils import _ORCID_URLS, _SEPARATORS, _VIAF_URLS
 
 
 def normalize_doi(val):
     """Normalize a DOI."""
     m = doi_regexp.match(val)
+    if m is None:
+        return val
     return m.group(2)
 
 
@@ -43,11 +46,9 @@ def normalize_ads(val):
 
 def normalize_orcid(val):
     """Normalize an ORCID identifier."""
-    for orcid_url in orcid_urls:
-        if val.startswith(orcid_url):
-            val = val[len(orcid_url) :]
-            break
-    val = val.replace("-", "").replace(" ", "")
+    if val.startswith(_ORCID_URLS):
+        val = val.partition("orcid.org/")[2]
+    val = val.translate(_SEPARATORS)
 
     return "-".join([val[0:4], val[4:8], val[8:12], val[12:16]])
 
@@ -56,47 +57,75 @@ def normalize_gnd(val):
     """Normalize a GND identifier."""
     if val.startswith(gnd_resolver_url):
         val = val[len(gnd_resolver_url) :]
-    if val.lower().startswith("gnd:"):
+    if val[:4].lower() == "gnd:":
         val = val[len("gnd:") :]
-    return "gnd:{0}".format(val)
+    return "gnd:" + val
 
 
 def normalize_urn(val):
     """Normalize a URN."""
     if val.startswith(urn_resolver_url):
         val = val[len(urn_resolver_url) :]
-    if val.lower().startswith("urn:"):
+    if val[:4].lower() == "urn:":
         val = val[len("urn:") :]
-    return "urn:{0}".format(val)
+    return "urn:" + val
 
 
 def normalize_pmid(val):
     """Normalize a PubMed ID."""
     m = pmid_regexp.match(val)
+    if m is None:
+        return val
     return m.group(2)
 
 
+def _is_canonical_arxiv_number(number):
+    """Test if a post-2007 arXiv number is already normalized, without regex.
+
+    E.g. ``1501.00001`` or ``1501.00001v2``.
+    """
+    number, sep, version = number.partition("v")
+    return (
+        number.isascii()
+        and len(number) in (9, 10)
+        and number[4] == "."
+        and number[:4].isdigit()
+        and number[5:].isdigit()
+        and (not sep or version.isascii() and version.isdigit())
+    )
+
+
 def normalize_arxiv(val):
     """Normalize an arXiv identifier."""
-    if not val.lower().startswith("arxiv:"):
-        val = "arXiv:{0}".format(val)
-    elif val[:6] != "arXiv:":
-        val = "arXiv:{0}".format(val[6:])
+    # A single trailing newline used to be accepted by the patterns' ``$``
+    if val[-1:] == "\n":
+        val = val[:-1]
+    val = "arXiv:" + (val[6:] if val[:6].lower() == "arxiv:" else val)
+
+    # The post-2007 and pre-2007 patterns are mutually exclusive, before and
+    # after rewriting, so at most one of the branches below applies. Only
+    # values with an old-style class contain a slash.
+    has_class = "/" in val
+    if has_class:
+        m = arxiv_post_2007_with_class_regexp.fullmatch(val)
+    elif _is_canonical_arxiv_number(val[6:]):
+        return val
+    else:
+        m = arxiv_post_2007_regexp.fullmatch(val)
+    if m:
+        val = "arXiv:" + ".".join(m.group(2, 3))
+        if m.group(4):
+            val += m.group(4)
+        return val
 
     # Normalize old identifiers to preferred scheme as specified by
     # http://arxiv.org/help/arxiv_identifier_for_services
     # (i.e. arXiv:math.GT/0309136 -> arXiv:math/0309136)
-    m = is_arxiv_pre_2007(val)
+    m = has_class and arxiv_pre_2007_regexp.fullmatch(val)
     if m and m.group(3):
         val = "".join(m.group(1, 2, 4, 5))
         if m.group(6):
             val += m.group(6)
-
-    m = is_arxiv_post_2007(val)
-    if m:
-        val = "arXiv:" + ".".join(m.group(2, 3))
-        if m.group(4):
-            val += m.group(4)
     return val
 
 
@@ -118,25 +147,43 @@ def normalize_isbn(val):
 
 def normalize_issn(val):
     """Normalize an ISSN identifier."""
-    val = val.replace(" ", "").replace("-", "").strip().upper()
-    return "{0}-{1}".format(val[:4], val[4:])
+    val = val.translate(_SEPARATORS).strip().upper()
+    return val[:4] + "-" + val[4:]
 
 
 def normalize_ror(val):
     """Normalize a ROR."""
     m = ror_regexp.match(val)
+    if m is None:
+        return val
     return m.group(1)
 
 
 def normalize_viaf(val):
     """Normalize a VIAF identifier."""
-    for viaf_url in viaf_urls:
-        if val.startswith(viaf_url):
-            val = val[len(viaf_url) :]
-            break
-    if val.lower().startswith("viaf:"):
+    if val.startswith(_VIAF_URLS):
+        val = val.partition("viaf.org/viaf/")[2]
+    if val[:5].lower() == "viaf:":
         val = val[len("viaf:") :]
-    return "viaf:{0}".format(val)
+    return "viaf:" + val
+
+
+IDUTILS_NORMALIZERS = {
+    "doi": normalize_doi,
+    "handle": normalize_handle,
+    "ads": normalize_ads,
+    "pmid": normalize_pmid,
+    "arxiv": normalize_arxiv,
+    "orcid": normalize_orcid,
+    "gnd": normalize_gnd,
+    "isbn": normalize_isbn,
+    "issn": normalize_issn,
+    "hal": normalize_hal,
+    "ror": normalize_ror,
+    "urn": normalize_urn,
+    "viaf": normalize_viaf,
+}
+"""Normalization functions for the supported PID providers."""
 
 
 def normalize_pid(val, scheme):
@@ -144,45 +191,35 @@ def normalize_pid(val, scheme):
 
     E.g. doi:10.1234/foo and http://dx.doi.org/10.1234/foo and 10.1234/foo
     will all be normalized to 10.1234/foo.
+
+    .. note:: Results of the normalizers in ``IDUTILS_NORMALIZERS`` are
+       cached per value and normalizer. Custom scheme normalizers are always
+       called.
     """
     if not val:
         return val
 
-    if scheme == "doi":
-        return normalize_doi(val)
-    elif scheme == "handle":
-        return normalize_handle(val)
-    elif scheme == "ads":
-        return normalize_ads(val)
-    elif scheme == "pmid":
-        return normalize_pmid(val)
-    elif scheme == "arxiv":
-        return normalize_arxiv(val)
-    elif scheme == "orcid":
-        return normalize_orcid(val)
-    elif scheme == "gnd":
-        return normalize_gnd(val)
-    elif scheme == "isbn":
-        return normalize_isbn(val)
-    elif scheme == "issn":
-        return normalize_issn(val)
-    elif scheme == "hal":
-        return normalize_hal(val)
-    elif scheme == "ror":
-        return normalize_ror(val)
-    elif scheme == "urn":
-        return normalize_urn(val)
-    elif scheme == "viaf":
-        return normalize_viaf(val)
-    else:
-        for custom_scheme, normalizer in custom_schemes_registry().pick_scheme_key(
-            "normalizer"
-        ):
-            if scheme == custom_scheme:
-                return normalizer(val)
+    normalizer = IDUTILS_NORMALIZERS.get(scheme)
+    if normalizer is not None:
+        return _normalize_pid(normalizer, val)
+    for custom_scheme, normalizer in custom_schemes_registry().pick_scheme_key(
+        "normalizer"
+    ):
+        if scheme == custom_scheme:
+            return normalizer(val)
     return val
 
 
+@lru_cache(maxsize=65536)
+def _normalize_pid(normalizer, val):
+    """Normalize an identifier with the given normalizer.
+
+    The normalizer is part of the cache key, so that changes to
+    ``IDUTILS_NORMALIZERS`` take effect.
+    """
+    return normalizer(val)
+
+
 IDUTILS_LANDING_URLS = {
     "doi": "{scheme}://doi.org/{pid}",
     "handle": "{scheme}://hdl.handle.net/{pid}",
@@ -212,6 +249,18 @@ IDUTILS_LANDING_URLS = {
 """URL generation configuration for the supported PID providers."""
 
 
+_LANDING_URL_HOSTS = {
+    template: template[len("{scheme}") : -len("{pid}")]
+    for template in IDUTILS_LANDING_URLS.values()
+    if template.startswith("{scheme}")
+    and template.endswith("{pid}")
+    and template.count("{") == template.count("}") == 2
+}
+"""Text between the fields of the ``{scheme}...{pid}`` landing URL templates.
+
+Templates of any other form, or added later, are formatted instead."""
+
+
 def to_url(val, scheme, url_scheme="http"):
     """Convert a resolvable identifier into a URL for a landing page.
 
@@ -222,10 +271,38 @@ def to_url(val, scheme, url_scheme="http"):
 
     .. versionadded:: 0.3.0
        ``url_scheme`` used for URL generation.
+
+    .. note:: URLs of the schemes in ``IDUTILS_LANDING_URLS`` are cached per
+       arguments, template and normalizer. Custom scheme URL generators are
+       always called.
     """
+    template = IDUTILS_LANDING_URLS.get(scheme)
+    if template is not None or scheme in ["purl", "url"]:
+        normalizer = IDUTILS_NORMALIZERS.get(scheme)
+        return _to_url(val, scheme, url_scheme, template, normalizer)
     pid = normalize_pid(val, scheme)
-    landing_urls = IDUTILS_LANDING_URLS
-    if scheme in landing_urls:
+    for custom_scheme, url_generator in custom_schemes_registry().pick_scheme_key(
+        "url_generator"
+    ):
+        if scheme == custom_scheme:
+            return url_generator(url_scheme, pid)
+
+    return ""
+
+
+@lru_cache(maxsize=65536)
+def _to_url(val, scheme, url_scheme, template, normalizer):
+    """Convert an identifier into a landing page URL of the given template.
+
+    ``template`` and ``normalizer`` are the entries of the scheme in
+    ``IDUTILS_LANDING_URLS`` and ``IDUTILS_NORMALIZERS``, passed so that
+    changes to them take effect.
+    """
+    if val and normalizer is not None:
+        pid = normalizer(val)
+    else:
+        pid = normalize_pid(val, scheme)
+    if template is not None:
         if scheme == "gnd" and pid.startswith("gnd:"):
             pid = pid[len("gnd:") :]
         if scheme == "urn" and not pid.lower().startswith("urn:nbn:"):
@@ -235,14 +312,8 @@ def to_url(val, scheme, url_scheme="http"):
         if scheme == "viaf" and pid.startswith("viaf:"):
             pid = pid[len("viaf:") :]
             url_scheme = "https"
-        return landing_urls[scheme].format(scheme=url_scheme, pid=pid)
-    elif scheme in ["purl", "url"]:
-        return pid
-    else:
-        for custom_scheme, url_generator in custom_schemes_registry().pick_scheme_key(
-            "url_generator"
-        ):
-            if scheme == custom_scheme:
-                return url_generator(url_scheme, pid)
-
-    return ""
+        host = _LANDING_URL_HOSTS.get(template)
+        if host is not None:
+            return f"{url_scheme}{host}{pid}"
+        return template.format(scheme=url_scheme, pid=pid)
+    return pid
@@ -15,66 +15,116 @@
 
 from . import validators
 
-IDUTILS_PID_SCHEMES = [
-    ("doi", validators.is_doi),
-    ("ark", validators.is_ark),
-    ("handle", validators.is_handle),
-    ("purl", validators.is_purl),
-    ("lsid", validators.is_lsid),
-    ("urn", validators.is_urn),
-    ("ads", validators.is_ads),
-    ("arxiv", validators.is_arxiv),
-    ("ascl", validators.is_ascl),
-    ("hal", validators.is_hal),
-    ("pmcid", validators.is_pmcid),
-    ("isbn", validators.is_isbn),
-    ("issn", validators.is_issn),
-    ("orcid", validators.is_orcid),
-    ("isni", validators.is_isni),
-    ("ean13", validators.is_ean13),
-    ("ean8", validators.is_ean8),
-    ("istc", validators.is_istc),
-    ("gnd", validators.is_gnd),
-    ("ror", validators.is_ror),
-    ("pmid", validators.is_pmid),
-    ("url", validators.is_url),
-    ("sra", validators.is_sra),
-    ("bioproject", validators.is_bioproject),
-    ("biosample", validators.is_biosample),
-    ("ensembl", validators.is_ensembl),
-    ("uniprot", validators.is_uniprot),
-    ("refseq", validators.is_refseq),
-    ("genome", validators.is_genome),
-    ("geo", validators.is_geo),
-    ("arrayexpress_array", validators.is_arrayexpress_array),
-    ("arrayexpress_experiment", validators.is_arrayexpress_experiment),
-    ("swh", validators.is_swh),
-    ("viaf", validators.is_viaf),
-]
+
+class _TrackedList(list):
+    """List counting the changes made to any such list in ``changes``.
+
+    Lets the detection tables built from these lists be checked for staleness
+    without comparing their entries. Entries changed in place (such as the
+    list of schemes of a filter) are not counted.
+    """
+
+    changes = 0
+
+
+def _track_changes(name):
+    """Return the list method of the given name, counting its calls."""
+    method = getattr(list, name)
+
+    def counted(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            # Counted after the change, so that tables built meanwhile from
+            # the changed list are rebuilt on the next check
+            _TrackedList.changes += 1
+
+    counted.__name__ = counted.__qualname__ = name
+    return counted
+
+
+for _name in (
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "__setitem__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+):
+    setattr(_TrackedList, _name, _track_changes(_name))
+del _name
+
+
+IDUTILS_PID_SCHEMES = _TrackedList(
+    [
+        ("doi", validators.is_doi),
+        ("ark", validators.is_ark),
+        ("handle", validators.is_handle),
+        ("purl", validators.is_purl),
+        ("lsid", validators.is_lsid),
+        ("urn", validators.is_urn),
+        ("ads", validators.is_ads),
+        ("arxiv", validators.is_arxiv),
+        ("ascl", validators.is_ascl),
+        ("hal", validators.is_hal),
+        ("pmcid", validators.is_pmcid),
+        ("isbn", validators.is_isbn),
+        ("issn", validators.is_issn),
+        ("orcid", validators.is_orcid),
+        ("isni", validators.is_isni),
+        ("ean13", validators.is_ean13),
+        ("ean8", validators.is_ean8),
+        ("istc", validators.is_istc),
+        ("gnd", validators.is_gnd),
+        ("ror", validators.is_ror),
+        ("pmid", validators.is_pmid),
+        ("url", validators.is_url),
+        ("sra", validators.is_sra),
+        ("bioproject", validators.is_bioproject),
+        ("biosample", validators.is_biosample),
+        ("ensembl", validators.is_ensembl),
+        ("uniprot", validators.is_uniprot),
+        ("refseq", validators.is_refseq),
+        ("genome", validators.is_genome),
+        ("geo", validators.is_geo),
+        ("arrayexpress_array", validators.is_arrayexpress_array),
+        ("arrayexpress_experiment", validators.is_arrayexpress_experiment),
+        ("swh", validators.is_swh),
+        ("viaf", validators.is_viaf),
+    ]
+)
 """Definition of scheme name and associated test function.
 
 Order of list is important, as identifier scheme detection will test in the
 order given by this list."""
 
 
-IDUTILS_SCHEME_FILTER = [
-    (
-        "url",
-        # None these can have URLs, in which case we exclude them
-        ["isbn", "istc", "urn", "lsid", "issn", "ean8", "viaf"],
-    ),
-    ("ean8", ["gnd", "pmid", "viaf"]),
-    ("ean13", ["gnd", "pmid"]),
-    ("isbn", ["gnd", "pmid"]),
-    ("orcid", ["gnd", "pmid"]),
-    ("isni", ["gnd", "pmid"]),
-    (
-        "issn",
-        [
-            "gnd",
-            "viaf",
-        ],
-    ),
-    ("pmid", ["viaf"]),
-]
+IDUTILS_SCHEME_FILTER = _TrackedList(
+    [
+        (
+            "url",
+            # None these can have URLs, in which case we exclude them
+            ["isbn", "istc", "urn", "lsid", "issn", "ean8", "viaf"],
+        ),
+        ("ean8", ["gnd", "pmid", "viaf"]),
+        ("ean13", ["gnd", "pmid"]),
+        ("isbn", ["gnd", "pmid"]),
+        ("orcid", ["gnd", "pmid"]),
+        ("isni", ["gnd", "pmid"]),
+        (
+            "issn",
+            [
+                "gnd",
+                "viaf",
+            ],
+        ),
+        ("pmid", ["viaf"]),
+    ]
+)
 """(present_scheme, [list of schemes to remove if present_scheme found])."""
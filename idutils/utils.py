@@ -14,16 +14,57 @@
 """Utility file containing ID parsers."""
 
 import re
+import string
 
 import isbnlib
 
+__all__ = (
+    "doi_regexp",
+    "handle_regexp",
+    "arxiv_post_2007_regexp",
+    "arxiv_pre_2007_regexp",
+    "arxiv_post_2007_with_class_regexp",
+    "hal_regexp",
+    "ads_regexp",
+    "pmcid_regexp",
+    "pmid_regexp",
+    "ark_suffix_regexp",
+    "lsid_regexp",
+    "orcid_urls",
+    "orcid_isni_ranges",
+    "gnd_regexp",
+    "gnd_resolver_url",
+    "urn_resolver_url",
+    "sra_regexp",
+    "bioproject_regexp",
+    "biosample_regexp",
+    "ENSEMBL_PREFIXES",
+    "ensembl_regexp",
+    "uniprot_regexp",
+    "refseq_regexp",
+    "genome_regexp",
+    "geo_regexp",
+    "ARRAYEXPRESS_CODES",
+    "arrayexpress_array_regexp",
+    "arrayexpress_experiment_regexp",
+    "ascl_regexp",
+    "swh_regexp",
+    "ror_regexp",
+    "viaf_urls",
+    "viaf_regexp",
+    "is_isbn10",
+    "is_isbn13",
+)
+
 doi_regexp = re.compile(
-    r"(doi:\s*|(?:https?://)?(?:dx\.)?doi\.org/)?(10\.\d+(\.\d+)*/.+)$", flags=re.I
+    r"(doi:\s*|(?:https?://)?(?:dx\.)?doi\.org/)?(10\.\d+(?:\.\d+)*/.+)$",
+    flags=re.I | re.A,
 )
 """See http://en.wikipedia.org/wiki/Digital_object_identifier."""
 
 handle_regexp = re.compile(
-    r"(hdl:\s*|(?:https?://)?hdl\.handle\.net/)?" r"([^/.]+(\.[^/.]+)*/.*)$", flags=re.I
+    r"(hdl:\s*|(?:https?://)?hdl\.handle\.net/)?" r"([^/.]+(?:\.[^/.]+)*/.*)$",
+    flags=re.I | re.A,
 )
 """See http://handle.net/rfc/rfc3651.html.
 
@@ -33,44 +74,58 @@ handle_regexp = re.compile(
 <LocalName>       = Any UTF8 char
 """
 
-arxiv_post_2007_regexp = re.compile(r"(arxiv:)?(\d{4})\.(\d{4,5})(v\d+)?$", flags=re.I)
+arxiv_post_2007_regexp = re.compile(
+    r"(arxiv:)?(\d{4})\.(\d{4,5})(v\d+)?$", flags=re.I | re.A
+)
 """See http://arxiv.org/help/arxiv_identifier and
        http://arxiv.org/help/arxiv_identifier_for_services."""
 
 arxiv_pre_2007_regexp = re.compile(
-    r"(arxiv:)?([a-z\-]+)(\.[a-z]{2})?(/\d{4})(\d+)(v\d+)?$", flags=re.I
+    r"(arxiv:)?([a-z\-]+)(\.[a-z]{2})?(/\d{4})(\d+)(v\d+)?$", flags=re.I | re.A
 )
 """See http://arxiv.org/help/arxiv_identifier and
        http://arxiv.org/help/arxiv_identifier_for_services."""
 
 arxiv_post_2007_with_class_regexp = re.compile(
-    r"(arxiv:)?(?:[a-z\-]+)(?:\.[a-z]{2})?/(\d{4})\.(\d{4,5})(v\d+)?$", flags=re.I
+    r"(arxiv:)?(?:[a-z\-]+)(?:\.[a-z]{2})?/(\d{4})\.(\d{4,5})(v\d+)?$",
+    flags=re.I | re.A,
 )
 """Matches new style arXiv ID, with an old-style class specification;
     technically malformed, however appears in real data."""
 
-hal_regexp = re.compile(r"(hal:|HAL:)?([a-z]{3}[a-z]*-|(sic|mem|ijn)_)\d{8}(v\d+)?$")
+_arxiv_regexp = re.compile(
+    r"(?:arxiv:)?"
+    r"(?:\d{4}\.\d{4,5}|[a-z\-]+(?:\.[a-z]{2})?/\d{4}(?:\.\d{4,5}|\d+))"
+    r"(?:v\d+)?$",
+    flags=re.I | re.A,
+)
+"""Matches any of the arXiv regular expressions above, in a single pass."""
+
+hal_regexp = re.compile(
+    r"(hal:|HAL:)?([a-z]{3}[a-z]*-|(sic|mem|ijn)_)\d{8}(v\d+)?$", flags=re.A
+)
 """Matches HAL identifiers (sic mem and ijn are old identifiers form)."""
 
 ads_regexp = re.compile(r"(ads:|ADS:)?(\d{4}[A-Za-z]\S{13}[A-Za-z.:])$")
 """See http://adsabs.harvard.edu/abs_doc/help_pages/data.html"""
 
-pmcid_regexp = re.compile(r"PMC\d+$", flags=re.I)
+pmcid_regexp = re.compile(r"PMC\d+$", flags=re.I | re.A)
 """PubMed Central ID regular expression."""
 
 pmid_regexp = re.compile(
-    r"(pmid:|https?://pubmed.ncbi.nlm.nih.gov/)?(\d+)/?$", flags=re.I
+    r"(pmid:|https?://pubmed\.ncbi\.nlm\.nih\.gov/)?(\d+)/?$", flags=re.I | re.A
 )
 """PubMed ID regular expression."""
 
-ark_suffix_regexp = re.compile(r"ark:/[0-9bcdfghjkmnpqrstvwxz]+/.+$")
+ark_suffix_regexp = re.compile(r"ark:/[0-9bcdfghjkmnpqrstvwxz]+/.+$", flags=re.A)
 """See http://en.wikipedia.org/wiki/Archival_Resource_Key and
        https://confluence.ucop.edu/display/Curation/ARK."""
 
-lsid_regexp = re.compile(r"urn:lsid:[^:]+(:[^:]+){2,3}$", flags=re.I)
+lsid_regexp = re.compile(r"urn:lsid:[^:]+(:[^:]+){2,3}$", flags=re.I | re.A)
 """See http://en.wikipedia.org/wiki/LSID."""
 
 orcid_urls = ["http://orcid.org/", "https://orcid.org/"]
+_ORCID_URLS = tuple(orcid_urls)
 orcid_isni_ranges = [
     (15_000_000, 35_000_000),
     (900_000_000_000, 900_100_000_000),
@@ -81,13 +136,23 @@ See
     https://support.orcid.org/hc/en-us/articles/360006897674-Structure-of-the-ORCID-Identifier
 """
 
+_ORCID_ISNI_BOUNDS = [
+    bound for start, end in sorted(orcid_isni_ranges) for bound in (start, end + 1)
+]
+"""Sorted start and end bounds of the ORCiD ISNI block ranges, for ``bisect``.
+
+A number is in a range when an odd number of bounds are less than or equal to
+it, i.e. when ``bisect_right`` returns an odd index.
+"""
+
 gnd_regexp = re.compile(
     r"(gnd:|GND:)?("
     r"(1|10)\d{7}[0-9X]|"
     r"[47]\d{6}-\d|"
     r"[1-9]\d{0,7}-[0-9X]|"
     r"3\d{7}[0-9X]"
-    r")"
+    r")",
+    flags=re.A,
 )
 """See https://www.wikidata.org/wiki/Property:P227."""
 
@@ -95,14 +160,14 @@ gnd_resolver_url = "http://d-nb.info/gnd/"
 
 urn_resolver_url = "https://nbn-resolving.org/"
 
-sra_regexp = re.compile(r"[SED]R[APRSXZ]\d+$")
+sra_regexp = re.compile(r"[SED]R[APRSXZ]\d+$", flags=re.A)
 """Sequence Read Archive regular expression.
 
 See
     https://www.ncbi.nlm.nih.gov/books/NBK56913/#search.what_do_the_different_sra_accessi
 """
 
-bioproject_regexp = re.compile(r"PRJ(NA|EA|EB|DB)\d+$")
+bioproject_regexp = re.compile(r"PRJ(NA|EA|EB|DB)\d+$", flags=re.A)
 """BioProject regular expression.
 
 See https://www.ddbj.nig.ac.jp/bioproject/faq-e.html#project-accession
@@ -110,7 +175,7 @@ See https://www.ddbj.nig.ac.jp/bioproject/faq-e.html#project-accession
     https://www.ncbi.nlm.nih.gov/bioproject/docs/faq/#under-what-circumstances-is-it-n
 """
 
-biosample_regexp = re.compile(r"SAM(N|EA|D)\d+$")
+biosample_regexp = re.compile(r"SAM(N|EA|D)\d+$", flags=re.A)
 """BioSample regular expression.
 
 See https://www.ddbj.nig.ac.jp/biosample/faq-e.html
@@ -165,7 +230,7 @@ ENSEMBL_PREFIXES = (
     "ENSAPL",  # Anas platyrhynchos (Duck)
     "ENSCEL",  # Caenorhabditis elegans (Caenorhabditis elegans)
     "ENSMEU",  # Notamacropus eugenii (Wallaby)
-    "ENSCGR",  # Cricetulus griseus (Chinese hamster CriGri)
+    "ENSCGR",  # Cricetulus griseus (Chinese hamster CriGri, CHOK1GS)
     "ENSANA",  # Aotus nancymaae (Ma's night monkey)
     "ENSGMO",  # Gadus morhua (Cod)
     "ENSPEM",  # Peromyscus maniculatus bairdii (Northern American deer mouse)
@@ -182,7 +247,6 @@ ENSEMBL_PREFIXES = (
     "ENSETE",  # Echinops telfairi (Lesser hedgehog tenrec)
     "ENSSBO",  # Saimiri boliviensis boliviensis (Bolivian squirrel monkey)
     "ENS",  # Homo sapiens (Human)
-    "ENSCGR",  # Cricetulus griseus (Chinese hamster CHOK1GS)
     "ENSFCA",  # Felis catus (Cat)
     "MGP_BALBcJ_",  # Mus musculus (Mouse BALB/cJ)
     "MGP_PahariEiJ_",  # Mus pahari (Shrew mouse)
@@ -243,17 +307,35 @@ See https://asia.ensembl.org/info/genome/stable_ids/prefixes.html
 
 ensembl_regexp = re.compile(
     r"({prefixes})(E|FM|G|GT|P|R|T)\d{{11}}$".format(
-        prefixes="|".join(ENSEMBL_PREFIXES)
-    )
+        prefixes="|".join(sorted(ENSEMBL_PREFIXES, key=len, reverse=True))
+    ),
+    flags=re.A,
 )
 """Ensembl regular expression.
 
+Longer prefixes are tried first, so that the most specific species prefix
+is tried before the shorter prefixes it starts with, such as ``ENS``.
+
 See https://asia.ensembl.org/info/genome/stable_ids/prefixes.html
 """
 
+_ENSEMBL_PREFIX_SET = frozenset(ENSEMBL_PREFIXES)
+"""Set of Ensembl prefixes, for looking up the prefix of a value."""
+
+_ENSEMBL_REGEXPS = {
+    length: re.compile(r"(.{%d})(E|FM|G|GT|P|R|T)\d{11}$" % length, flags=re.S | re.A)
+    for length in {len(prefix) for prefix in ENSEMBL_PREFIXES}
+}
+"""Ensembl regular expressions for each prefix length.
+
+Each one matches like ensembl_regexp, once the prefix of that length has
+been found in the set of prefixes.
+"""
+
 uniprot_regexp = re.compile(
-    r"([A-NR-Z][0-9]([A-Z][A-Z0-9]{2}[0-9]){1,2})|"
-    r"([OPQ][0-9][A-Z0-9]{3}[0-9])(\.\d+)?$"
+    r"(?:([A-NR-Z][0-9]([A-Z][A-Z0-9]{2}[0-9]){1,2})|"
+    r"([OPQ][0-9][A-Z0-9]{3}[0-9]))(\.\d+)?$",
+    flags=re.A,
 )
 """UniProt regular expression.
 
@@ -261,20 +343,21 @@ See https://www.uniprot.org/help/accession_numbers
 """
 
 refseq_regexp = re.compile(
-    r"((AC|NC|NG|NT|NW|NM|NR|XM|XR|AP|NP|YP|XP|WP)_|" r"NZ_[A-Z]{4})\d+(\.\d+)?$"
+    r"((AC|NC|NG|NT|NW|NM|NR|XM|XR|AP|NP|YP|XP|WP)_|" r"NZ_[A-Z]{4})\d+(\.\d+)?$",
+    flags=re.A,
 )
 """RefSeq regular expression.
 
 See https://academic.oup.com/nar/article/44/D1/D733/2502674 (Table 1)
 """
 
-genome_regexp = re.compile(r"GC[AF]_\d+\.\d+$")
+genome_regexp = re.compile(r"GC[AF]_\d+\.\d+$", flags=re.A)
 """GenBank or RefSeq genome assembly accession.
 
 See https://www.ebi.ac.uk/ena/browse/genome-assembly-database
 """
 
-geo_regexp = re.compile(r"G(PL|SM|SE|DS)\d+$")
+geo_regexp = re.compile(r"G(PL|SM|SE|DS)\d+$", flags=re.A)
 """Gene Expression Omnibus (GEO) accession.
 
 See https://www.ncbi.nlm.nih.gov/geo/info/overview.html#org
@@ -338,8 +421,26 @@ Used for building arrayexpress_array_regexp and arrayexpress_experiment_regexp.
 See https://www.ebi.ac.uk/arrayexpress/help/accession_codes.html
 """
 
+
+def _factor_codes(codes):
+    """Return an alternation of codes, grouped by their first character.
+
+    E.g. ``AFFY|AGIL|BASE`` becomes ``A(?:FFY|GIL)|B(?:ASE)``, so that a
+    value is only compared against the codes sharing its first character.
+    """
+    by_first = {}
+    for code in codes:
+        by_first.setdefault(code[0], []).append(re.escape(code[1:]))
+    return "|".join(
+        "{0}(?:{1})".format(re.escape(first), "|".join(rests))
+        for first, rests in by_first.items()
+    )
+
+
+_ARRAYEXPRESS_CODES_PATTERN = _factor_codes(ARRAYEXPRESS_CODES)
+
 arrayexpress_array_regexp = re.compile(
-    r"A-({codes})-\d+$".format(codes="|".join(ARRAYEXPRESS_CODES))
+    r"A-({codes})-\d+$".format(codes=_ARRAYEXPRESS_CODES_PATTERN), flags=re.A
 )
 """ArrayExpress array accession.
 
@@ -347,23 +448,30 @@ See https://www.ebi.ac.uk/arrayexpress/help/accession_codes.html
 """
 
 arrayexpress_experiment_regexp = re.compile(
-    r"E-({codes})-\d+$".format(codes="|".join(ARRAYEXPRESS_CODES))
+    r"E-({codes})-\d+$".format(codes=_ARRAYEXPRESS_CODES_PATTERN), flags=re.A
 )
 """ArrayExpress array accession.
 
 See https://www.ebi.ac.uk/arrayexpress/help/accession_codes.html
 """
 
-ascl_regexp = re.compile(r"^ascl:[0-9]{4}\.[0-9]{3,4}$", flags=re.I)
+ascl_regexp = re.compile(r"^ascl:[0-9]{4}\.[0-9]{3,4}$", flags=re.I | re.A)
 """ASCL regular expression."""
 
 swh_regexp = re.compile(
     r"swh:1:(cnt|dir|rel|rev|snp):[0-9a-f]{40}"
-    r"(;(origin|visit|anchor|path|lines)=\S+)*$"
+    r"(;(origin|visit|anchor|path|lines)=\S+)?$"
 )
-"""Matches Software Heritage identifiers."""
+"""Matches Software Heritage identifiers.
 
-ror_regexp = re.compile(r"(?:https?://)?(?:ror\.org/)?(0\w{6}\d{2})$", flags=re.I)
+A single optional qualifier group accepts the same values as a repeated one,
+since a qualifier value also matches any following qualifiers, but it cannot
+backtrack exponentially on values which do not match.
+"""
+
+ror_regexp = re.compile(
+    r"(?:https?://)?(?:ror\.org/)?(0\w{6}\d{2})$", flags=re.I | re.A
+)
 """See https://ror.org/facts/#core-components."""
 
 viaf_urls = [
@@ -372,17 +480,26 @@ viaf_urls = [
     "http://www.viaf.org/viaf/",
     "https://www.viaf.org/viaf/",
 ]
+_VIAF_URLS = tuple(viaf_urls)
 
 viaf_regexp = re.compile(
     r"(viaf:|VIAF:)?([1-9]\d(?:\d{0,7}|\d{17,20}))($|\/|\?|#)",
-    flags=re.I,
+    flags=re.I | re.A,
 )
 """See https://www.wikidata.org/wiki/Property:P214."""
 
 
-def _convert_x_to_10(x):
-    """Convert char to int with X being converted to 10."""
-    return int(x) if x != "X" else 10
+_SEPARATORS = str.maketrans("", "", "- ")
+"""Translation table removing hyphens and spaces from an identifier."""
+
+_SEPARATORS_UPPER = str.maketrans(
+    {"-": None, " ": None, **{char: char.upper() for char in string.ascii_lowercase}}
+)
+"""Translation table removing hyphens and spaces and upper-casing ASCII letters.
+
+Checksummed identifiers only contain ASCII letters, so leaving other letters
+alone tests the same as calling ``upper()``, in a single pass.
+"""
 
 
 is_isbn10 = isbnlib.is_isbn10
@@ -390,3 +507,6 @@ is_isbn10 = isbnlib.is_isbn10
 
 is_isbn13 = isbnlib.is_isbn13
 """Test if argument is an ISBN-13 number."""
+
+_isbn_canonical = isbnlib.canonical
+"""Keep only the digits and check character of an ISBN, or return ''."""
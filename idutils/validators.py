@@ -15,27 +15,117 @@
 
 
 import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from operator import mul
 from urllib.parse import urlparse
 
 from .utils import *
-from .utils import _convert_x_to_10
+from .utils import (
+    _ENSEMBL_PREFIX_SET,
+    _ENSEMBL_REGEXPS,
+    _ORCID_ISNI_BOUNDS,
+    _ORCID_URLS,
+    _SEPARATORS,
+    _SEPARATORS_UPPER,
+    _VIAF_URLS,
+    _arxiv_regexp,
+    _isbn_canonical,
+)
+
+# Bound ``fullmatch`` methods, resolved once instead of on every validator call.
+# The patterns end with ``$``, which would also accept a trailing newline with
+# ``match``. GND identifiers are matched as a prefix, see ``is_gnd``.
+_doi_match = doi_regexp.fullmatch
+_handle_match = handle_regexp.fullmatch
+_arxiv_post_2007_match = arxiv_post_2007_regexp.fullmatch
+_arxiv_post_2007_with_class_match = arxiv_post_2007_with_class_regexp.fullmatch
+_arxiv_pre_2007_match = arxiv_pre_2007_regexp.fullmatch
+_arxiv_match = _arxiv_regexp.fullmatch
+_hal_match = hal_regexp.fullmatch
+_ads_match = ads_regexp.fullmatch
+_pmcid_match = pmcid_regexp.fullmatch
+_pmid_match = pmid_regexp.fullmatch
+_ark_suffix_match = ark_suffix_regexp.fullmatch
+_lsid_match = lsid_regexp.fullmatch
+_gnd_match = gnd_regexp.match
+_sra_match = sra_regexp.fullmatch
+_bioproject_match = bioproject_regexp.fullmatch
+_biosample_match = biosample_regexp.fullmatch
+_uniprot_match = uniprot_regexp.fullmatch
+_refseq_match = refseq_regexp.fullmatch
+_genome_match = genome_regexp.fullmatch
+_geo_match = geo_regexp.fullmatch
+_arrayexpress_array_match = arrayexpress_array_regexp.fullmatch
+_arrayexpress_experiment_match = arrayexpress_experiment_regexp.fullmatch
+_ascl_match = ascl_regexp.fullmatch
+_swh_match = swh_regexp.fullmatch
+_ror_match = ror_regexp.fullmatch
+_viaf_match = viaf_regexp.fullmatch
+
+# URL validators parse the same value in turn, so keep recent parse results.
+_urlparse = lru_cache(maxsize=1024)(urlparse)
+
+_PURL_NETLOCS = frozenset(
+    ["purl.org", "purl.oclc.org", "purl.net", "purl.com", "purl.fdlp.gov"]
+)
+
+
+class _DigitValues(dict):
+    """Values of digit characters, for converting digits without ``int``.
+
+    ASCII digits are looked up directly. Any other character is converted by
+    ``int`` instead, so it is accepted (e.g. other Unicode decimal digits) or
+    raises ``ValueError`` exactly like ``int`` would.
+    """
+
+    def __init__(self, base=10, **extra):
+        """Build the table of the ASCII digits of the given base."""
+        digits = "0123456789ABCDEF"[:base]
+        super().__init__(((char, int(char, base)) for char in digits), **extra)
+        self.base = base
+
+    def __missing__(self, char):
+        """Convert a character which is not in the table."""
+        return int(char, self.base)
+
+
+_digit_value = _DigitValues().__getitem__
+_digit_or_x_value = _DigitValues(X=10).__getitem__
+_hex_digit_value = _DigitValues(16).__getitem__
+
+# Checksum weights of each digit.
+_ISSN_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 1)
+_ISTC_WEIGHTS = (11, 9, 3, 1, 11, 9, 3, 1, 11, 9, 3, 1, 11, 9, 3)
+# Closed form of the ISNI recurrence r = (r + digit) * 2 over 15 digits.
+_ISNI_WEIGHTS = tuple(2**i for i in range(15, 0, -1))
+# ISTC check characters, indexed by the weighted sum modulo 16.
+_ISTC_CHECK_CHARS = "0123456789ABCDEF"
 
 
 def is_isbn(val):
     """Test if argument is an ISBN-10 or ISBN-13 number."""
-    if is_isbn10(val) or is_isbn13(val):
-        if val[0:3] in ["978", "979"] or not is_ean13(val):
-            return True
-    return False
+    if len(val) < 10:  # Too short to hold the digits of any ISBN
+        return False
+    # Canonicalize once and only run the check matching the length; both
+    # checks canonicalize again, which leaves a canonical value unchanged.
+    isbn = _isbn_canonical(val)
+    if len(isbn) == 10:
+        valid = is_isbn10(isbn)
+    elif len(isbn) == 13:
+        valid = is_isbn13(isbn)
+    else:
+        return False
+    return valid and (val[0:3] in ("978", "979") or not is_ean13(val))
 
 
 def is_issn(val):
     """Test if argument is an ISSN number."""
     try:
-        val = val.replace("-", "").replace(" ", "").upper()
+        val = val.translate(_SEPARATORS_UPPER)
         if len(val) != 8:
             return False
-        r = sum([(8 - i) * (_convert_x_to_10(x)) for i, x in enumerate(val)])
+        r = sum(map(mul, _ISSN_WEIGHTS, map(_digit_or_x_value, val)))
         return not (r % 11)
     except ValueError:
         return False
@@ -46,21 +136,20 @@ def is_istc(val):
 
     See http://www.istc-international.org/html/about_structure_syntax.aspx
     """
-    val = val.replace("-", "").replace(" ", "").upper()
+    # Upper-case all letters, as e.g. "\ufb00" (ff) becomes the hex digits "FF"
+    val = val.translate(_SEPARATORS).upper()
     if len(val) != 16:
         return False
-    sequence = [11, 9, 3, 1]
     try:
-        r = sum([int(x, 16) * sequence[i % 4] for i, x in enumerate(val[:-1])])
-        ck = hex(r % 16)[2:].upper()
-        return ck == val[-1]
+        r = sum(map(mul, _ISTC_WEIGHTS, map(_hex_digit_value, val[:-1])))
+        return _ISTC_CHECK_CHARS[r % 16] == val[-1]
     except ValueError:
         return False
 
 
 def is_doi(val):
     """Test if argument is a DOI."""
-    return doi_regexp.match(val)
+    return _doi_match(val)
 
 
 def is_handle(val):
@@ -69,16 +158,19 @@ def is_handle(val):
     Note, DOIs are also handles, and handle are very generic so they will also
     match e.g. any URL your parse.
     """
-    return handle_regexp.match(val) and not swh_regexp.match(val)
+    if "/" not in val:  # No slash between prefix and suffix, skip matching
+        return None
+    return _handle_match(val) and not _swh_match(val)
 
 
 def is_ean8(val):
     """Test if argument is a International Article Number (EAN-8)."""
     if len(val) != 8:
         return False
-    sequence = [3, 1]
     try:
-        r = sum([int(x) * sequence[i % 2] for i, x in enumerate(val[:-1])])
+        # Digits are weighted 3 and 1 in turn, so sum every other digit.
+        r = 3 * sum(map(_digit_value, val[0:7:2]))
+        r += sum(map(_digit_value, val[1:7:2]))
         ck = (10 - r % 10) % 10
         return ck == int(val[-1])
     except ValueError:
@@ -89,9 +181,10 @@ def is_ean13(val):
     """Test if argument is a International Article Number (EAN-13)."""
     if len(val) != 13:
         return False
-    sequence = [1, 3]
     try:
-        r = sum([int(x) * sequence[i % 2] for i, x in enumerate(val[:-1])])
+        # Digits are weighted 1 and 3 in turn, so sum every other digit.
+        r = sum(map(_digit_value, val[0:12:2]))
+        r += 3 * sum(map(_digit_value, val[1:12:2]))
         ck = (10 - r % 10) % 10
         return ck == int(val[-1])
     except ValueError:
@@ -108,15 +201,17 @@ def is_ean(val):
 
 def is_isni(val):
     """Test if argument is an International Standard Name Identifier."""
-    val = val.replace("-", "").replace(" ", "").upper()
+    return _is_isni(val.translate(_SEPARATORS_UPPER))
+
+
+def _is_isni(val):
+    """Test if an ISNI without separators and in upper case is valid."""
     if len(val) != 16:
         return False
     try:
-        r = 0
-        for x in val[:-1]:
-            r = (r + int(x)) * 2
+        r = sum(map(mul, _ISNI_WEIGHTS, map(_digit_value, val[:-1])))
         ck = (12 - r % 11) % 11
-        return ck == _convert_x_to_10(val[-1])
+        return ck == _digit_or_x_value(val[-1])
     except ValueError:
         return False
 
@@ -127,81 +222,83 @@ def is_orcid(val):
     See http://support.orcid.org/knowledgebase/
         articles/116780-structure-of-the-orcid-identifier
     """
-    for orcid_url in orcid_urls:
-        if val.startswith(orcid_url):
-            val = val[len(orcid_url) :]
-            break
+    if val.startswith(_ORCID_URLS):
+        val = val.partition("orcid.org/")[2]
 
-    val = val.replace("-", "").replace(" ", "")
-    if is_isni(val):
+    val = val.translate(_SEPARATORS_UPPER)
+    if _is_isni(val):
         val = int(val[:-1], 10)  # Remove check digit and convert to int.
-        return any(start <= val <= end for start, end in orcid_isni_ranges)
+        return bisect_right(_ORCID_ISNI_BOUNDS, val) % 2 == 1
     return False
 
 
 def is_ark(val):
     """Test if argument is an ARK."""
-    res = urlparse(val)
-    return ark_suffix_regexp.match(val) or (
+    res = _ark_suffix_match(val)
+    if res or "ark:/" not in val:  # Bare ARK, or no ARK to find in a URL path
+        return res
+    res = _urlparse(val)
+    return (
         res.scheme == "http"
         and res.netloc != ""
         and
         # Note res.path includes leading slash, hence [1:] to use same reexp
-        ark_suffix_regexp.match(res.path[1:])
+        _ark_suffix_match(res.path[1:])
         and res.params == ""
     )
 
 
 def is_purl(val):
     """Test if argument is a PURL."""
-    res = urlparse(val)
-    purl_netlocs = [
-        "purl.org",
-        "purl.oclc.org",
-        "purl.net",
-        "purl.com",
-        "purl.fdlp.gov",
-    ]
+    if ":" not in val:
+        # No URL scheme, skip parsing
+        return False
+    res = _urlparse(val)
     return (
-        res.scheme in ["http", "https"]
-        and res.netloc in purl_netlocs
+        res.scheme in ("http", "https")
+        and res.netloc in _PURL_NETLOCS
         and res.path != ""
     )
 
 
 def is_url(val):
     """Test if argument is a URL."""
-    res = urlparse(val)
+    if ":" not in val:
+        # No URL scheme, skip parsing
+        return False
+    res = _urlparse(val)
     return bool(res.scheme and res.netloc and res.params == "")
 
 
 def is_lsid(val):
     """Test if argument is a LSID."""
-    return is_urn(val) and lsid_regexp.match(val)
+    # Any value matching lsid_regexp starts with "urn:", so it is also a URN.
+    return _lsid_match(val)
 
 
 def is_urn(val):
     """Test if argument is an URN."""
-    res = urlparse(val)
+    if ":" not in val:
+        # No URL scheme, skip parsing
+        return False
+    res = _urlparse(val)
     return bool(res.scheme == "urn" and res.netloc == "" and res.path != "")
 
 
 def is_ads(val):
     """Test if argument is an ADS bibliographic code."""
     val = unicodedata.normalize("NFKD", val)
-    return ads_regexp.match(val)
+    return _ads_match(val)
 
 
 def is_arxiv_post_2007(val):
     """Test if argument is a post-2007 arXiv ID."""
-    return arxiv_post_2007_regexp.match(val) or arxiv_post_2007_with_class_regexp.match(
-        val
-    )
+    return _arxiv_post_2007_match(val) or _arxiv_post_2007_with_class_match(val)
 
 
 def is_arxiv_pre_2007(val):
     """Test if argument is a pre-2007 arXiv ID."""
-    return arxiv_pre_2007_regexp.match(val)
+    return _arxiv_pre_2007_match(val)
 
 
 def is_arxiv(val):
@@ -210,7 +307,7 @@ def is_arxiv(val):
     See http://arxiv.org/help/arxiv_identifier and
         http://arxiv.org/help/arxiv_identifier_for_services.
     """
-    return is_arxiv_post_2007(val) or is_arxiv_pre_2007(val)
+    return _arxiv_match(val)
 
 
 def is_hal(val):
@@ -218,7 +315,7 @@ def is_hal(val):
 
     See (https://hal.archives-ouvertes.fr)
     """
-    return hal_regexp.match(val)
+    return _hal_match(val)
 
 
 def is_pmid(val):
@@ -227,12 +324,12 @@ def is_pmid(val):
     Warning: PMID are just integers, with no structure, so this function will
     say any integer is a PubMed ID
     """
-    return pmid_regexp.match(val)
+    return _pmid_match(val)
 
 
 def is_pmcid(val):
     """Test if argument is a PubMed Central ID."""
-    return pmcid_regexp.match(val)
+    return _pmcid_match(val)
 
 
 def is_gnd(val):
@@ -240,62 +337,71 @@ def is_gnd(val):
     if val.startswith(gnd_resolver_url):
         val = val[len(gnd_resolver_url) :]
 
-    return gnd_regexp.match(val)
+    # gnd_regexp has no end anchor, so any trailing characters are accepted.
+    return _gnd_match(val)
 
 
 def is_sra(val):
     """Test if argument is an SRA accession."""
-    return sra_regexp.match(val)
+    return _sra_match(val)
 
 
 def is_bioproject(val):
     """Test if argument is a BioProject accession."""
-    return bioproject_regexp.match(val)
+    return _bioproject_match(val)
 
 
 def is_biosample(val):
     """Test if argument is a BioSample accession."""
-    return biosample_regexp.match(val)
+    return _biosample_match(val)
 
 
 def is_ensembl(val):
     """Test if argument is an Ensembl accession."""
-    return ensembl_regexp.match(val)
+    # The type and the 11 digits leave only two possible prefix lengths, so
+    # look the prefix up instead of trying each alternative of ensembl_regexp.
+    for length in (len(val) - 12, len(val) - 13):
+        regexp = _ENSEMBL_REGEXPS.get(length)
+        if regexp and val[:length] in _ENSEMBL_PREFIX_SET:
+            res = regexp.fullmatch(val)
+            if res:
+                return res
+    return None
 
 
 def is_uniprot(val):
     """Test if argument is a UniProt accession."""
-    return uniprot_regexp.match(val)
+    return _uniprot_match(val)
 
 
 def is_refseq(val):
     """Test if argument is a RefSeq accession."""
-    return refseq_regexp.match(val)
+    return _refseq_match(val)
 
 
 def is_genome(val):
     """Test if argument is a GenBank or RefSeq genome assembly accession."""
-    return genome_regexp.match(val)
+    return _genome_match(val)
 
 
 def is_geo(val):
     """Test if argument is a Gene Expression Omnibus (GEO) accession."""
-    return geo_regexp.match(val)
+    return _geo_match(val)
 
 
 def is_arrayexpress_array(val):
     """Test if argument is an ArrayExpress array accession."""
-    return arrayexpress_array_regexp.match(val)
+    return _arrayexpress_array_match(val)
 
 
 def is_arrayexpress_experiment(val):
     """Test if argument is an ArrayExpress experiment accession."""
-    return arrayexpress_experiment_regexp.match(val)
+    return _arrayexpress_experiment_match(val)
 
 
 def is_ascl(val):
     """Test if argument is a ASCL accession."""
-    return ascl_regexp.match(val)
+    return _ascl_match(val)
 
 
 def is_swh(val):
@@ -303,21 +409,41 @@ def is_swh(val):
 
     https://docs.softwareheritage.org/devel/swh-model/persistent-identifiers.html
     """
-    return swh_regexp.match(val)
+    return _swh_match(val)
 
 
 def is_ror(val):
     """Test if argument is a ROR id."""
-    return ror_regexp.match(val)
+    return _ror_match(val)
 
 
 def is_viaf(val):
     """Test if argument is a VIAF id."""
-    for viaf_url in viaf_urls:
-        if val.startswith(viaf_url):
-            return True
-    res = viaf_regexp.match(val)
-    if res:
-        return viaf_regexp.match(val).group() == val
-    else:
-        return False
+    if val.startswith(_VIAF_URLS):
+        return True
+    return _viaf_match(val) is not None
+
+
+# Validators which only match a pattern, mapped to the bound matcher they call,
+# so that scheme detection can call the matcher without the extra frame.
+_PATTERN_VALIDATORS = {
+    is_doi: _doi_match,
+    is_lsid: _lsid_match,
+    is_arxiv_pre_2007: _arxiv_pre_2007_match,
+    is_arxiv: _arxiv_match,
+    is_hal: _hal_match,
+    is_pmid: _pmid_match,
+    is_pmcid: _pmcid_match,
+    is_sra: _sra_match,
+    is_bioproject: _bioproject_match,
+    is_biosample: _biosample_match,
+    is_uniprot: _uniprot_match,
+    is_refseq: _refseq_match,
+    is_genome: _genome_match,
+    is_geo: _geo_match,
+    is_arrayexpress_array: _arrayexpress_array_match,
+    is_arrayexpress_experiment: _arrayexpress_experiment_match,
+    is_ascl: _ascl_match,
+    is_swh: _swh_match,
+    is_ror: _ror_match,
+}
@@ -25,3 +25,24 @@ def test_custom_registry_singleton(entry_points):
     instance2 = custom_schemes_registry()
 
     assert instance1 is instance2
+
+
+def test_pick_scheme_key_returns_copy(entry_points):
+    """Test that modifying a picked list does not change later results."""
+    registry = custom_schemes_registry()
+
+    picked = registry.pick_scheme_key("validator")
+    picked.append(("other_scheme", None))
+
+    assert ("other_scheme", None) not in registry.pick_scheme_key("validator")
+
+
+def test_registry_version(entry_points):
+    """Test that the version changes whenever entry points are loaded."""
+    registry = custom_schemes_registry()
+    version = registry.version
+    assert version >= 1
+
+    registry._load_entry_points("idutils.custom_schemes")
+
+    assert registry.version == version + 1
@@ -794,6 +794,15 @@ def test_detect_schemes(entry_points):
         assert schemes == expected_schemes, i
 
 
+def test_detect_schemes_many(entry_points):
+    """Test scheme detection of many values at once."""
+    values = [i for i, _, _, _ in identifiers]
+    assert idutils.detect_identifier_schemes_many(values) == [
+        expected_schemes for _, expected_schemes, _, _ in identifiers
+    ]
+    assert idutils.detect_identifier_schemes_many(iter([])) == []
+
+
 def test_is_type():
     """Test type detection."""
     for i, schemes, normalized_value, url_value in identifiers:
@@ -833,6 +842,33 @@ def test_to_url(entry_points):
         )
 
 
+def test_changed_config(entry_points):
+    """Test that changes to the normalizers and landing URLs take effect."""
+    from idutils import normalizers
+
+    assert idutils.normalize_pid("doi:10.1234/foo", "doi") == "10.1234/foo"
+    assert idutils.to_url("doi:10.1234/foo", "doi") == "http://doi.org/10.1234/foo"
+    normalizers.IDUTILS_NORMALIZERS["doi"] = str.upper
+    normalizers.IDUTILS_LANDING_URLS["doi"] = "{scheme}://example.org/{pid}/"
+    try:
+        assert idutils.normalize_pid("doi:10.1234/foo", "doi") == "DOI:10.1234/FOO"
+        assert (
+            idutils.to_url("doi:10.1234/foo", "doi")
+            == "http://example.org/DOI:10.1234/FOO/"
+        )
+    finally:
+        normalizers.IDUTILS_NORMALIZERS["doi"] = normalizers.normalize_doi
+        normalizers.IDUTILS_LANDING_URLS["doi"] = "{scheme}://doi.org/{pid}"
+    assert idutils.normalize_pid("doi:10.1234/foo", "doi") == "10.1234/foo"
+    assert idutils.to_url("doi:10.1234/foo", "doi") == "http://doi.org/10.1234/foo"
+
+
+def test_to_url_any_url_scheme():
+    """Test that URL schemes are formatted like any template field."""
+    assert idutils.to_url("10.1234/foo", "doi", None) == "None://doi.org/10.1234/foo"
+    assert idutils.to_url("10.1234/foo", "doi", b"x") == "b'x'://doi.org/10.1234/foo"
+
+
 def test_valueerror(entry_points):
     """Test for bad validators."""
     # Many validators rely on a special length of the identifier before
@@ -844,12 +880,73 @@ def test_valueerror(entry_points):
         assert idutils.detect_identifier_schemes(nonsense_pid) == []
 
 
+def test_scheme_candidates():
+    """Test that detection only skips validators which cannot match."""
+    from idutils import detectors
+
+    tables = detectors._current_scheme_tables()
+    names = {bit: scheme for scheme, bit in tables.scheme_order}
+    for i, _, _, _ in identifiers:
+        for val in (i, i.upper(), i.lower(), i.swapcase()):
+            matching = [
+                scheme for scheme, test in idutils.IDUTILS_PID_SCHEMES if test(val)
+            ]
+            by_length = tables.candidates.get(val[:1])
+            if by_length is None:
+                continue
+            bucket = by_length[min(len(val), detectors._MAX_LENGTH_BUCKET)]
+            tested = [names[bit] for bit, _ in bucket]
+            assert [scheme for scheme in matching if scheme not in tested] == [], val
+
+
+def test_added_scheme(entry_points):
+    """Test detection of a scheme added to the list after import."""
+    scheme = ("foo", lambda val: val.lower().startswith(("foo:", "\u0192oo:")))
+    idutils.IDUTILS_PID_SCHEMES.append(scheme)
+    try:
+        assert idutils.detect_identifier_schemes("foo:1") == ["foo"]
+        assert idutils.detect_identifier_schemes("\u0192oo:1") == ["foo"]
+        assert idutils.detect_identifier_schemes_many(["foo:2"]) == [["foo"]]
+    finally:
+        idutils.IDUTILS_PID_SCHEMES.remove(scheme)
+    assert idutils.detect_identifier_schemes("foo:1") == []
+
+
+def test_repeated_scheme(entry_points):
+    """Test detection of a scheme listed twice."""
+    scheme = ("doi", lambda val: val.lower().startswith("foo:"))
+    idutils.IDUTILS_PID_SCHEMES.append(scheme)
+    try:
+        assert idutils.detect_identifier_schemes("foo:1") == ["doi"]
+        assert idutils.detect_identifier_schemes("10.1234/foo") == ["doi", "handle"]
+    finally:
+        idutils.IDUTILS_PID_SCHEMES.remove(scheme)
+    assert idutils.detect_identifier_schemes("foo:1") == []
+
+
 def test_compund_ean():
     """Test EAN validation."""
     assert idutils.is_ean("4006381333931")
     assert idutils.is_ean("73513537")
 
 
+def test_checksum_non_digits():
+    """Test checksum validation of values with non-digit characters."""
+    assert not idutils.is_issn("0317-84A1")
+    assert not idutils.is_ean8("7351353a")
+    assert not idutils.is_ean8("735a3537")
+    # Other Unicode decimal digits are still converted like ``int`` does
+    assert idutils.is_issn("０３１７-８４７１")
+    assert idutils.is_ean8("７３５１３５３７")
+
+
+def test_istc():
+    """Test ISTC validation."""
+    assert idutils.is_istc("0A9200912B4A1FF1")
+    # Upper-casing the ligature yields the hex digits "FF"
+    assert idutils.is_istc("0A9200912B4A1\ufb001")
+
+
 def test_compund_isbn():
     """Test ISBN validation."""
     assert idutils.is_isbn("978-3-905673-82-1")
@@ -875,3 +972,63 @@ def test_ascl():
     assert idutils.is_ascl("ascl:1908.011")
     assert idutils.is_ascl("ascl:1908.0113")
     assert not idutils.is_ascl("1990.0803")
+
+
+def test_swh():
+    """Test SWHID validation."""
+    swhid = "swh:1:cnt:94a9ed024d3859793618152ea559a168bbcbb5e2"
+    assert idutils.is_swh(swhid + ";origin=https://example.org;lines=1-3")
+    # A long qualifier chain which does not match must fail quickly.
+    assert not idutils.is_swh(swhid + ";origin=a" * 5000 + " ")
+
+
+def test_uniprot():
+    """Test UniProt validation."""
+    assert idutils.is_uniprot("A0A023GPI8")
+    assert idutils.is_uniprot("P02833.2")
+    assert not idutils.is_uniprot("A0A023GPI8xyz")
+    # The first accession form is no longer matched at the start only
+    assert not idutils.is_uniprot("A0A0232GPI8")
+
+
+def test_trailing_newline():
+    """Test that a trailing newline is not part of an identifier."""
+    assert not idutils.is_doi("10.1234/foo\n")
+    assert not idutils.is_pmcid("PMC123\n")
+    assert idutils.detect_identifier_schemes("10.1234/foo\n") == []
+    assert idutils.normalize_arxiv("arXiv:1501.00001\n") == "arXiv:1501.00001"
+    assert idutils.normalize_arxiv("hep-th/9901001\n") == "arXiv:hep-th/9901001"
+
+
+def test_ascii_digits():
+    """Test that only ASCII digits are accepted in identifiers."""
+    assert idutils.is_pmid("123")
+    assert not idutils.is_pmid("١٢٣")
+    assert not idutils.is_doi("10.١/foo")
+
+
+def test_normalize_non_ascii_digits():
+    """Test that values with non-ASCII digits are normalized unchanged."""
+    assert idutils.normalize_pid("06١", "pmid") == "06١"
+    assert idutils.to_url("06١", "pmid") == "http://pubmed.ncbi.nlm.nih.gov/06١"
+    assert idutils.normalize_pid("10.١/foo", "doi") == "10.١/foo"
+    assert idutils.normalize_pid("0abcdé012", "ror") == "0abcdé012"
+
+
+def test_stricter_patterns():
+    """Test values which only matched the patterns before they were tightened."""
+    assert not idutils.is_ror("0abcdé012")
+    assert not idutils.is_doi("doi:\xa010.1234/foo")
+    assert not idutils.is_ascl("a\u017fcl:1234.123")
+    assert not idutils.is_pmid("https://pubmedXncbi.nlm.nih.gov/123")
+    assert idutils.is_pmid("https://pubmed.ncbi.nlm.nih.gov/123")
+
+
+def test_star_import():
+    """Test that star imports only get the names defined by the submodules."""
+    namespace = {}
+    exec("from idutils import *", namespace)
+    assert {"is_doi", "is_isbn10", "normalize_pid", "to_url", "doi_regexp"} <= set(
+        namespace
+    )
+    assert {"re", "importlib", "warn", "lru_cache", "isbnlib"}.isdisjoint(namespace)